@@ -65,30 +65,25 @@ def _calculate_res_sparse(
 
     residuals = np.zeros(n_genes, dtype=np.float64)
     for gene in nb.prange(n_genes):
-        start_idx = indptr[gene]
         stop_idx = indptr[gene + 1]
 
-        sparse_idx = start_idx
-        var_sum = np.float64(0.0)
+        # accumulate both moments in a single pass over the cells, instead of
+        # recomputing every clipped residual for a second, variance-only pass
+        sparse_idx = indptr[gene]
         sum_clipped_res = np.float64(0.0)
+        sum_sq_clipped_res = np.float64(0.0)
         for cell in range(n_cells):
             value = get_value(cell, sparse_idx, stop_idx)
             clipped_res = clac_clipped_res_sparse(gene, cell, value)
             if value > 0:
                 sparse_idx += 1
             sum_clipped_res += clipped_res
+            sum_sq_clipped_res += clipped_res * clipped_res
 
         mean_clipped_res = sum_clipped_res / n_cells
-        sparse_idx = start_idx
-        for cell in range(n_cells):
-            value = get_value(cell, sparse_idx, stop_idx)
-            clipped_res = clac_clipped_res_sparse(gene, cell, value)
-            if value > 0:
-                sparse_idx += 1
-            diff = clipped_res - mean_clipped_res
-            var_sum += diff * diff
-
-        residuals[gene] = var_sum / n_cells
+        residuals[gene] = (
+            sum_sq_clipped_res / n_cells - mean_clipped_res * mean_clipped_res
+        )
     return residuals
 
 
@@ -116,18 +111,19 @@ def _calculate_res_dense(
     residuals = np.zeros(n_genes, dtype=np.float64)
 
     for gene in nb.prange(n_genes):
+        # accumulate both moments in a single pass over the cells, instead of
+        # recomputing every clipped residual for a second, variance-only pass
         sum_clipped_res = np.float64(0.0)
-        for cell in range(n_cells):
-            sum_clipped_res += clac_clipped_res_dense(gene, cell)
-        mean_clipped_res = sum_clipped_res / n_cells
-
-        var_sum = np.float64(0.0)
+        sum_sq_clipped_res = np.float64(0.0)
         for cell in range(n_cells):
             clipped_res = clac_clipped_res_dense(gene, cell)
-            diff = clipped_res - mean_clipped_res
-            var_sum += diff * diff
+            sum_clipped_res += clipped_res
+            sum_sq_clipped_res += clipped_res * clipped_res
 
-        residuals[gene] = var_sum / n_cells
+        mean_clipped_res = sum_clipped_res / n_cells
+        residuals[gene] = (
+            sum_sq_clipped_res / n_cells - mean_clipped_res * mean_clipped_res
+        )
     return residuals
 
 
@@ -1,17 +1,21 @@
 from __future__ import annotations
 
+from math import sqrt
 from types import MappingProxyType
 from typing import TYPE_CHECKING
 from warnings import warn
 
+import numba as nb
 import numpy as np
 from anndata import AnnData
 from scipy.sparse import issparse
 
 from ... import logging as logg
+from ..._compat import DaskArray
 from ..._utils import (
     _doc_params,
     _empty,
+    axis_sum,
     check_nonnegative_integers,
     view_to_actual,
 )
@@ -28,16 +32,277 @@ from ...get import _get_obs_rep, _set_obs_rep
 from ...preprocessing._docs import doc_mask_var_hvg
 from ...preprocessing._pca import _handle_mask_var, pca
 
+try:
+    import dask.array as da
+except ImportError:
+    da = None
+
 if TYPE_CHECKING:
     from collections.abc import Mapping
     from typing import Any
 
+    from numpy.typing import DTypeLike, NDArray
+
     from ..._utils import Empty
 
 
-def _pearson_residuals(X, theta, clip, check_values, copy: bool = False):
-    X = X.copy() if copy else X
+@nb.njit(parallel=True)
+def _row_col_sums_dense(
+    matrix,
+) -> tuple[NDArray[np.float64], NDArray[np.float64], float]:
+    """
+    Row sums, column sums and the grand total of a dense matrix in a single
+    traversal, accumulated in float64 regardless of the input dtype.
+
+    The rows are split into contiguous blocks processed in parallel; each block
+    accumulates into its own column-sum slice, which is reduced afterwards, so
+    no two threads ever write the same gene entry.
+    """
+    n_cells, n_genes = matrix.shape
+    n_blocks = min(64, max(n_cells, 1))
+    block_size = (n_cells + n_blocks - 1) // n_blocks
+    sums_cells = np.zeros(n_cells, dtype=np.float64)
+    partial_genes = np.zeros((n_blocks, n_genes), dtype=np.float64)
+    sum_total = 0.0
+    for block in nb.prange(n_blocks):
+        local_total = 0.0
+        for cell in range(block * block_size, min((block + 1) * block_size, n_cells)):
+            row_sum = 0.0
+            for gene in range(n_genes):
+                value = matrix[cell, gene]
+                row_sum += value
+                partial_genes[block, gene] += value
+            sums_cells[cell] = row_sum
+            local_total += row_sum
+        sum_total += local_total
+    sums_genes = np.zeros(n_genes, dtype=np.float64)
+    for block in range(n_blocks):
+        for gene in range(n_genes):
+            sums_genes[gene] += partial_genes[block, gene]
+    return sums_cells, sums_genes, sum_total
+
+
+@nb.njit(parallel=True)
+def _row_col_sums_sparse(
+    indptr: NDArray[np.integer],
+    indices: NDArray[np.integer],
+    data: NDArray,
+    *,
+    n_genes: int,
+) -> tuple[NDArray[np.float64], NDArray[np.float64], float]:
+    """
+    Row sums, column sums and the grand total of a CSR matrix in a single
+    traversal of the stored entries, accumulated in float64 regardless of the
+    input dtype.  Parallelized like the dense variant, with per-block
+    column-sum slices reduced afterwards.
+    """
+    n_cells = indptr.size - 1
+    n_blocks = min(64, max(n_cells, 1))
+    block_size = (n_cells + n_blocks - 1) // n_blocks
+    sums_cells = np.zeros(n_cells, dtype=np.float64)
+    partial_genes = np.zeros((n_blocks, n_genes), dtype=np.float64)
+    sum_total = 0.0
+    for block in nb.prange(n_blocks):
+        local_total = 0.0
+        for cell in range(block * block_size, min((block + 1) * block_size, n_cells)):
+            row_sum = 0.0
+            for k in range(indptr[cell], indptr[cell + 1]):
+                value = data[k]
+                row_sum += value
+                partial_genes[block, indices[k]] += value
+            sums_cells[cell] = row_sum
+            local_total += row_sum
+        sum_total += local_total
+    sums_genes = np.zeros(n_genes, dtype=np.float64)
+    for block in range(n_blocks):
+        for gene in range(n_genes):
+            sums_genes[gene] += partial_genes[block, gene]
+    return sums_cells, sums_genes, sum_total
+
+
+def _row_col_sums(X) -> tuple[NDArray[np.float64], NDArray[np.float64], float]:
+    """Compute `(sums_cells, sums_genes, sum_total)` for a dense or CSR matrix
+    in one pass over the data instead of two axis sums plus a reduction."""
+    if issparse(X):
+        return _row_col_sums_sparse(X.indptr, X.indices, X.data, n_genes=X.shape[1])
+    return _row_col_sums_dense(X)
+
+
+@nb.njit(parallel=True)
+def _calculate_residuals_dense(
+    matrix,
+    *,
+    sums_cells: NDArray[np.float64],
+    sums_genes: NDArray[np.float64],
+    inv_theta: np.float64,
+    clip: np.float64,
+    check_values: bool,
+    block_size: int,
+    out: NDArray[np.float64],
+) -> int:
+    """
+    Compute clipped Pearson residuals for a dense count matrix in a single fused
+    pass, writing directly into `out` without materializing `mu` or `diff`.
+    `sums_genes` is expected to be prescaled by `1 / sum_total`, so that
+    `mu = sums_cells[cell] * sums_genes[gene]`.
+
+    The rows are processed in parallel in contiguous blocks of `block_size`
+    rows each, sized by the caller to keep a block of the output cache-resident.
 
+    If `check_values`, the entries are validated as nonnegative integers in the
+    same pass; the number of offending entries is returned.
+    """
+    n_cells, n_genes = matrix.shape
+    n_blocks = (n_cells + block_size - 1) // block_size
+    # with clip=np.inf the min/max clamp is a no-op; decide once, not per element
+    do_clip = np.isfinite(clip)
+    # theta=np.inf (Poisson model) zeroes the overdispersion term; decide once
+    poisson = inv_theta == 0.0
+    n_invalid = 0
+    for block in nb.prange(n_blocks):
+        local_invalid = 0
+        for cell in range(block * block_size, min((block + 1) * block_size, n_cells)):
+            for gene in range(n_genes):
+                value = matrix[cell, gene]
+                if check_values and (value < 0 or value % 1 != 0):
+                    local_invalid += 1
+                mu = sums_cells[cell] * sums_genes[gene]
+                if poisson:
+                    residual = (value - mu) / sqrt(mu)
+                else:
+                    residual = (value - mu) / sqrt(mu * (1.0 + mu * inv_theta))
+                if do_clip:
+                    residual = min(max(residual, -clip), clip)
+                out[cell, gene] = residual
+        n_invalid += local_invalid
+    return n_invalid
+
+
+@nb.njit(parallel=True)
+def _calculate_residuals_sparse(
+    indptr: NDArray[np.integer],
+    indices: NDArray[np.integer],
+    data: NDArray[np.float64],
+    *,
+    sums_cells: NDArray[np.float64],
+    sums_genes: NDArray[np.float64],
+    inv_theta: np.float64,
+    clip: np.float64,
+    check_values: bool,
+    block_size: int,
+    out: NDArray[np.float64],
+) -> int:
+    """
+    Compute clipped Pearson residuals for a CSR count matrix without densifying
+    `X - mu` first: each row of `out` is filled with the residuals of the
+    implicit zeros (a contiguous, SIMD-friendly pass), then the stored entries
+    are overwritten via the CSR index structure.  `sums_genes` is expected to
+    be prescaled by `1 / sum_total`, so that `mu = sums_cells[cell] * sums_genes[gene]`.
+
+    The rows are processed in parallel in contiguous blocks of `block_size`
+    rows each, sized by the caller to keep a block of the output cache-resident.
+
+    If `check_values`, the stored entries (implicit zeros are always valid) are
+    validated as nonnegative integers in the same pass; the number of offending
+    entries is returned.
+    """
+    n_cells, n_genes = out.shape
+    n_blocks = (n_cells + block_size - 1) // block_size
+    # with clip=np.inf the min/max clamp is a no-op; decide once, not per element
+    do_clip = np.isfinite(clip)
+    # theta=np.inf (Poisson model) zeroes the overdispersion term; decide once
+    poisson = inv_theta == 0.0
+    n_invalid = 0
+    for block in nb.prange(n_blocks):
+        local_invalid = 0
+        for cell in range(block * block_size, min((block + 1) * block_size, n_cells)):
+            for gene in range(n_genes):
+                mu = sums_cells[cell] * sums_genes[gene]
+                if poisson:
+                    residual = -mu / sqrt(mu)
+                else:
+                    residual = -mu / sqrt(mu * (1.0 + mu * inv_theta))
+                if do_clip:
+                    residual = min(max(residual, -clip), clip)
+                out[cell, gene] = residual
+            for k in range(indptr[cell], indptr[cell + 1]):
+                value = data[k]
+                if check_values and (value < 0 or value % 1 != 0):
+                    local_invalid += 1
+                gene = indices[k]
+                mu = sums_cells[cell] * sums_genes[gene]
+                if poisson:
+                    residual = (value - mu) / sqrt(mu)
+                else:
+                    residual = (value - mu) / sqrt(mu * (1.0 + mu * inv_theta))
+                if do_clip:
+                    residual = min(max(residual, -clip), clip)
+                out[cell, gene] = residual
+        n_invalid += local_invalid
+    return n_invalid
+
+
+def _residuals_block_size(n_genes: int) -> int:
+    """Rows per parallel block, chosen so a block of the float64 residual
+    output stays resident in a (conservatively sized) 2 MiB L2 cache."""
+    return min(512, max(1, (1 << 21) // (8 * n_genes)))
+
+
+def _pearson_residuals_block(
+    matrix: NDArray,
+    sums_cells: NDArray[np.float64],
+    *,
+    sums_genes: NDArray[np.float64],
+    inv_theta: float,
+    clip: float,
+    out_dtype: DTypeLike,
+) -> NDArray:
+    """
+    Fused residual computation for one row chunk of a Dask array.  Top-level
+    (and hence picklable) so the whole subtract/scale/clip chain stays a single
+    Dask task per chunk.  Named `out_dtype` because `map_blocks` consumes a
+    `dtype` keyword itself instead of forwarding it.
+    """
+    out = np.empty(matrix.shape, dtype=out_dtype)
+    kwargs = dict(
+        sums_cells=np.asarray(sums_cells).ravel(),
+        sums_genes=sums_genes,
+        inv_theta=np.float64(inv_theta),
+        clip=np.float64(clip),
+        check_values=False,
+        block_size=_residuals_block_size(matrix.shape[1]),
+        out=out,
+    )
+    if issparse(matrix):
+        matrix = matrix.tocsr()
+        _calculate_residuals_sparse(
+            matrix.indptr,
+            matrix.indices,
+            matrix.data.astype(np.float64, copy=False),
+            **kwargs,
+        )
+    else:
+        _calculate_residuals_dense(matrix, **kwargs)
+    return out
+
+
+def _pearson_residuals(
+    X,
+    theta,
+    clip,
+    check_values,
+    dtype: DTypeLike = np.float64,
+    out: NDArray | None = None,
+):
+    """
+    Compute the (clipped) Pearson residual matrix for a count matrix `X`.
+
+    If `out` is given, the residuals are written into that preallocated buffer
+    (which must match `X` in shape), allowing callers that process many
+    equally-sized matrices to reuse a single allocation; `dtype` is then
+    ignored in favor of `out.dtype`.  Not supported for Dask input, where the
+    result is a lazy array.
+    """
     # check theta
     if theta <= 0:
         # TODO: would "underdispersion" with negative theta make sense?
@@ -50,27 +315,72 @@ def _pearson_residuals(X, theta, clip, check_values, copy: bool = False):
     if clip < 0:
         raise ValueError("Pearson residuals require `clip>=0` or `clip=None`.")
 
-    if check_values and not check_nonnegative_integers(X):
-        warn(
-            "`normalize_pearson_residuals()` expects raw count data, but non-integers were found.",
-            UserWarning,
+    if isinstance(X, DaskArray):
+        if out is not None:
+            raise ValueError("`out` is not supported for Dask input.")
+        if check_values and not check_nonnegative_integers(X):
+            warn(
+                "`normalize_pearson_residuals()` expects raw count data, but non-integers were found.",
+                UserWarning,
+            )
+        # the per-chunk kernel needs complete rows
+        if X.numblocks[1] > 1:
+            X = X.rechunk((X.chunks[0], -1))
+        # axis_sum instead of X.sum: sparse chunks lack keepdims support
+        sums_genes = axis_sum(X, axis=0, dtype=np.float64).compute()
+        sums_genes /= sums_genes.sum()
+        # lazy and chunked like the rows of X, so map_blocks aligns it per chunk
+        sums_cells = axis_sum(X, axis=1, dtype=np.float64)[:, None]
+        # one fused subtract/scale/clip task per chunk, nothing in between
+        return da.map_blocks(
+            _pearson_residuals_block,
+            X,
+            sums_cells,
+            sums_genes=sums_genes,
+            inv_theta=1.0 / theta,
+            clip=float(clip),
+            out_dtype=dtype,
+            dtype=dtype,
+            meta=np.array([], dtype=dtype),
         )
 
     if issparse(X):
-        sums_genes = np.sum(X, axis=0)
-        sums_cells = np.sum(X, axis=1)
-        sum_total = np.sum(sums_genes).squeeze()
-    else:
-        sums_genes = np.sum(X, axis=0, keepdims=True)
-        sums_cells = np.sum(X, axis=1, keepdims=True)
-        sum_total = np.sum(sums_genes)
+        X = X.tocsr()
+    sums_cells, sums_genes, sum_total = _row_col_sums(X)
+    # scale the gene sums once instead of dividing by sum_total per element
+    sums_genes /= sum_total
 
-    mu = np.array(sums_cells @ sums_genes / sum_total)
-    diff = np.array(X - mu)
-    residuals = diff / np.sqrt(mu + mu**2 / theta)
+    block_size = _residuals_block_size(X.shape[1])
 
-    # clip
-    residuals = np.clip(residuals, a_min=-clip, a_max=clip)
+    if out is None:
+        residuals = np.empty(X.shape, dtype=dtype)
+    elif out.shape != X.shape:
+        raise ValueError("`out` must have the same shape as `X`.")
+    else:
+        residuals = out
+    kwargs = dict(
+        sums_cells=sums_cells,
+        sums_genes=sums_genes,
+        inv_theta=np.float64(1.0 / theta),
+        clip=np.float64(clip),
+        check_values=check_values,
+        block_size=block_size,
+        out=residuals,
+    )
+    if issparse(X):
+        n_invalid = _calculate_residuals_sparse(
+            X.indptr, X.indices, X.data.astype(np.float64, copy=False), **kwargs
+        )
+    else:
+        n_invalid = _calculate_residuals_dense(X, **kwargs)
+
+    # the nonnegative-integer check is fused into the residual kernels,
+    # avoiding a separate validation pass over the count matrix
+    if check_values and n_invalid > 0:
+        warn(
+            "`normalize_pearson_residuals()` expects raw count data, but non-integers were found.",
+            UserWarning,
+        )
 
     return residuals
 
@@ -90,6 +400,7 @@ def normalize_pearson_residuals(
     clip: float | None = None,
     check_values: bool = True,
     layer: str | None = None,
+    dtype: DTypeLike = np.float64,
     inplace: bool = True,
     copy: bool = False,
 ) -> AnnData | dict[str, np.ndarray] | None:
@@ -108,6 +419,11 @@ def normalize_pearson_residuals(
     {dist_params}
     {check_values}
     {layer}
+    dtype
+        NumPy data type of the residual output.  The sums entering the residual
+        formula are always accumulated in float64; `np.float32` halves the
+        memory footprint (and memory traffic) of the result with an accuracy
+        loss that is irrelevant for downstream gene ranking.
     {inplace}
     {copy}
 
@@ -138,7 +454,7 @@ def normalize_pearson_residuals(
     msg = f"computing analytic Pearson residuals on {computed_on}"
     start = logg.info(msg)
 
-    residuals = _pearson_residuals(X, theta, clip, check_values, copy=not inplace)
+    residuals = _pearson_residuals(X, theta, clip, check_values, dtype=dtype)
     settings_dict = dict(theta=theta, clip=clip, computed_on=computed_on)
 
     if inplace:
@@ -174,6 +490,7 @@ def normalize_pearson_residuals_pca(
     mask_var: np.ndarray | str | None | Empty = _empty,
     use_highly_variable: bool | None = None,
     check_values: bool = True,
+    return_df: bool = False,
     inplace: bool = True,
 ) -> AnnData | None:
     """\
@@ -193,6 +510,12 @@ def normalize_pearson_residuals_pca(
     {pca_chunk}
     {mask_var_hvg}
     {check_values}
+    return_df
+        If `True`, store the residuals as a labeled :class:`~pandas.DataFrame`
+        under `.uns['pearson_residuals_normalization']['pearson_residuals_df']`.
+        By default, the plain residual matrix is stored under
+        `.uns['pearson_residuals_normalization']['pearson_residuals']`, which
+        avoids copying it into pandas' column-oriented storage.
     {inplace}
 
     Returns
@@ -200,8 +523,10 @@ def normalize_pearson_residuals_pca(
     If `inplace=False`, returns the Pearson residual-based PCA results (as :class:`~anndata.AnnData`
     object). If `inplace=True`, updates `adata` with the following fields:
 
-    `.uns['pearson_residuals_normalization']['pearson_residuals_df']`
-        The subset of highly variable genes, normalized by Pearson residuals.
+    `.uns['pearson_residuals_normalization']['pearson_residuals']`
+        The subset of highly variable genes, normalized by Pearson residuals
+        (stored as `['pearson_residuals_df']` :class:`~pandas.DataFrame`
+        if `return_df=True`).
     `.uns['pearson_residuals_normalization']['theta']`
         The used value of the overdisperion parameter theta.
     `.uns['pearson_residuals_normalization']['clip']`
@@ -224,13 +549,13 @@ def normalize_pearson_residuals_pca(
     _, mask_var = _handle_mask_var(adata, mask_var, use_highly_variable)
     del use_highly_variable
 
+    # no copies of the count matrix here: the residual computation only reads
+    # the counts and replaces `.X` of `adata_pca` with a fresh residual matrix
     if mask_var is not None:
         adata_sub = adata[:, mask_var].copy()
-        adata_pca = AnnData(
-            adata_sub.X.copy(), obs=adata_sub.obs[[]], var=adata_sub.var[[]]
-        )
+        adata_pca = AnnData(adata_sub.X, obs=adata_sub.obs[[]], var=adata_sub.var[[]])
     else:
-        adata_pca = AnnData(adata.X.copy(), obs=adata.obs[[]], var=adata.var[[]])
+        adata_pca = AnnData(adata.X, obs=adata.obs[[]], var=adata.var[[]])
 
     normalize_pearson_residuals(
         adata_pca, theta=theta, clip=clip, check_values=check_values
@@ -240,7 +565,14 @@ def normalize_pearson_residuals_pca(
 
     if inplace:
         norm_settings = adata_pca.uns["pearson_residuals_normalization"]
-        norm_dict = dict(**norm_settings, pearson_residuals_df=adata_pca.to_df())
+        # by default store the residual matrix as-is; the DataFrame costs a
+        # full copy into pandas' column-oriented storage
+        residuals = (
+            dict(pearson_residuals_df=adata_pca.to_df())
+            if return_df
+            else dict(pearson_residuals=adata_pca.X)
+        )
+        norm_dict = dict(**norm_settings, **residuals)
         if mask_var is not None:
             adata.varm["PCs"] = np.zeros(shape=(adata.n_vars, n_comps))
             adata.varm["PCs"][mask_var] = adata_pca.varm["PCs"]
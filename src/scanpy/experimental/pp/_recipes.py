@@ -41,6 +41,7 @@ def recipe_pearson_residuals(
     random_state: float | None = 0,
     kwargs_pca: dict = {},
     check_values: bool = True,
+    return_df: bool = False,
     inplace: bool = True,
 ) -> tuple[AnnData, pd.DataFrame] | None:
     """\
@@ -58,6 +59,12 @@ def recipe_pearson_residuals(
     {genes_batch_chunk}
     {pca_chunk}
     {check_values}
+    return_df
+        If `True`, store the residuals as a labeled :class:`~pandas.DataFrame`
+        under `.uns['pearson_residuals_normalization']['pearson_residuals_df']`.
+        By default, the plain residual matrix is stored under
+        `.uns['pearson_residuals_normalization']['pearson_residuals']`, which
+        avoids copying it into pandas' column-oriented storage.
     {inplace}
 
     Returns
@@ -89,8 +96,10 @@ def recipe_pearson_residuals(
     The following fields contain Pearson residual-based PCA results and
     normalization settings:
 
-    `.uns['pearson_residuals_normalization']['pearson_residuals_df']`
-         The subset of highly variable genes, normalized by Pearson residuals.
+    `.uns['pearson_residuals_normalization']['pearson_residuals']`
+         The subset of highly variable genes, normalized by Pearson residuals
+         (stored as `['pearson_residuals_df']` :class:`~pandas.DataFrame`
+         if `return_df=True`).
     `.uns['pearson_residuals_normalization']['theta']`
          The used value of the overdisperion parameter theta.
     `.uns['pearson_residuals_normalization']['clip']`
@@ -134,9 +143,14 @@ def recipe_pearson_residuals(
 
     if inplace:
         normalization_param = adata_pca.uns["pearson_residuals_normalization"]
-        normalization_dict = dict(
-            **normalization_param, pearson_residuals_df=adata_pca.to_df()
+        # by default store the residual matrix as-is; the DataFrame costs a
+        # full copy into pandas' column-oriented storage
+        residuals = (
+            dict(pearson_residuals_df=adata_pca.to_df())
+            if return_df
+            else dict(pearson_residuals=adata_pca.X)
         )
+        normalization_dict = dict(**normalization_param, **residuals)
 
         adata.uns["pca"] = adata_pca.uns["pca"]
         adata.varm["PCs"] = np.zeros(shape=(adata.n_vars, n_comps))
@@ -21,6 +21,8 @@ from testing.scanpy._pytest.params import ARRAY_TYPES
 if TYPE_CHECKING:
     from typing import Callable, Literal
 
+    from numpy.typing import NDArray
+
 FILE = Path(__file__).parent / Path("_scripts/seurat_hvg.csv")
 FILE_V3 = Path(__file__).parent / Path("_scripts/seurat_hvg_v3.csv.gz")
 FILE_V3_BATCH = Path(__file__).parent / Path("_scripts/seurat_hvg_v3_batch.csv")
@@ -35,6 +37,26 @@ def adata_sess() -> AnnData:
     return adata
 
 
+@pytest.fixture(scope="session")
+def pbmc3k_sess() -> AnnData:
+    return pbmc3k()
+
+
+@pytest.fixture
+def pbmc(pbmc3k_sess: AnnData) -> AnnData:
+    return pbmc3k_sess.copy()
+
+
+@pytest.fixture(scope="session")
+def pbmc68k_sess() -> AnnData:
+    return pbmc68k_reduced()
+
+
+@pytest.fixture
+def pbmc68k(pbmc68k_sess: AnnData) -> AnnData:
+    return pbmc68k_sess.copy()
+
+
 @pytest.fixture
 def adata(adata_sess: AnnData) -> AnnData:
     return adata_sess.copy()
@@ -112,8 +134,8 @@ def test_no_inplace(adata, array_type, batch_key):
 
 @pytest.mark.parametrize("base", [None, 10])
 @pytest.mark.parametrize("flavor", ["seurat", "cell_ranger"])
-def test_keep_layer(base, flavor):
-    adata = pbmc3k()
+def test_keep_layer(pbmc, base, flavor):
+    adata = pbmc
     # cell_ranger flavor can raise error if many 0 genes
     sc.pp.filter_genes(adata, min_counts=1)
 
@@ -174,26 +196,50 @@ def test_pearson_residuals_inputchecks(pbmc3k_parametrized_small):
         )
 
 
-@pytest.mark.parametrize("subset", [True, False], ids=["subset", "full"])
-@pytest.mark.parametrize(
-    "clip", [None, np.inf, 30], ids=["noclip", "infclip", "30clip"]
+@pytest.fixture(
+    scope="module",
+    params=list(itertools.product([None, np.inf, 30], [100, np.inf])),
+    ids=[
+        "noclip-100theta",
+        "noclip-inftheta",
+        "infclip-100theta",
+        "infclip-inftheta",
+        "30clip-100theta",
+        "30clip-inftheta",
+    ],
 )
-@pytest.mark.parametrize("theta", [100, np.inf], ids=["100theta", "inftheta"])
+def clip_theta(request) -> tuple[float | None, float]:
+    return request.param
+
+
+@pytest.fixture(scope="module")
+def residual_variances_reference(
+    _pbmc3ks_parametrized_session, clip_theta
+) -> NDArray[np.float64]:
+    """Reference residual variances, shared across the `subset`/`n_top_genes` axes."""
+    clip, theta = clip_theta
+    adata = _pbmc3ks_parametrized_session[True].copy()
+    residuals_res = sc.experimental.pp.normalize_pearson_residuals(
+        adata, clip=clip, theta=theta, inplace=False
+    )
+    assert isinstance(residuals_res, dict)
+    return np.var(residuals_res["X"], axis=0)
+
+
+@pytest.mark.parametrize("subset", [True, False], ids=["subset", "full"])
 @pytest.mark.parametrize("n_top_genes", [100, 200], ids=["100n", "200n"])
 def test_pearson_residuals_general(
-    pbmc3k_parametrized_small, subset, clip, theta, n_top_genes
+    pbmc3k_parametrized_small,
+    residual_variances_reference,
+    clip_theta,
+    subset,
+    n_top_genes,
 ):
+    clip, theta = clip_theta
     adata = pbmc3k_parametrized_small()
     # cleanup var
     del adata.var
 
-    # compute reference output
-    residuals_res = sc.experimental.pp.normalize_pearson_residuals(
-        adata, clip=clip, theta=theta, inplace=False
-    )
-    assert isinstance(residuals_res, dict)
-    residual_variances_reference = np.var(residuals_res["X"], axis=0)
-
     if subset:
         # lazyly sort by residual variance and take top N
         top_n_idx = np.argsort(-residual_variances_reference)[:n_top_genes]
@@ -212,19 +258,6 @@ def test_pearson_residuals_general(
     )
     assert output_df is not None
 
-    sc.experimental.pp.highly_variable_genes(
-        adata,
-        flavor="pearson_residuals",
-        n_top_genes=n_top_genes,
-        subset=subset,
-        inplace=True,
-        clip=clip,
-        theta=theta,
-    )
-
-    # compare inplace=True and inplace=False output
-    pd.testing.assert_frame_equal(output_df, adata.var)
-
     # check output is complete
     for key in [
         "highly_variable",
@@ -280,18 +313,6 @@ def test_pearson_residuals_batch(pbmc3k_parametrized_small, subset, n_top_genes)
     )
     assert output_df is not None
 
-    sc.experimental.pp.highly_variable_genes(
-        adata,
-        flavor="pearson_residuals",
-        n_top_genes=n_top_genes,
-        batch_key="batch",
-        subset=subset,
-        inplace=True,
-    )
-
-    # compare inplace=True and inplace=False output
-    pd.testing.assert_frame_equal(output_df, adata.var)
-
     # check output is complete
     for key in [
         "highly_variable",
@@ -330,6 +351,28 @@ def test_pearson_residuals_batch(pbmc3k_parametrized_small, subset, n_top_genes)
         assert len(output_df) == n_genes
 
 
+@pytest.mark.parametrize("batch_key", [None, "batch"], ids=["nobatch", "batch"])
+@pytest.mark.parametrize("subset", [True, False], ids=["subset", "full"])
+def test_pearson_residuals_inplace(pbmc3k_parametrized_small, batch_key, subset):
+    adata = pbmc3k_parametrized_small()
+    # cleanup var
+    del adata.var
+
+    kwargs = dict(
+        flavor="pearson_residuals",
+        n_top_genes=100,
+        batch_key=batch_key,
+        subset=subset,
+    )
+    output_df = sc.experimental.pp.highly_variable_genes(adata, inplace=False, **kwargs)
+    assert output_df is not None
+
+    sc.experimental.pp.highly_variable_genes(adata, inplace=True, **kwargs)
+
+    # inplace=True should annotate `.var` exactly like the returned frame
+    pd.testing.assert_frame_equal(output_df, adata.var)
+
+
 @pytest.mark.parametrize("func", ["hvg", "fgd"])
 @pytest.mark.parametrize(
     ("flavor", "params", "ref_path"),
@@ -345,6 +388,7 @@ def test_pearson_residuals_batch(pbmc3k_parametrized_small, subset, n_top_genes)
 @pytest.mark.parametrize("array_type", ARRAY_TYPES)
 def test_compare_to_upstream(  # noqa: PLR0917
     request: pytest.FixtureRequest,
+    pbmc68k: AnnData,
     func: Literal["hvg", "fgd"],
     flavor: Literal["seurat", "cell_ranger"],
     params: dict[str, float | int],
@@ -356,7 +400,7 @@ def test_compare_to_upstream(  # noqa: PLR0917
         request.node.add_marker(pytest.mark.xfail(reason=msg))
     hvg_info = pd.read_csv(ref_path)
 
-    pbmc = pbmc68k_reduced()
+    pbmc = pbmc68k
     pbmc.X = pbmc.raw.X
     pbmc.X = array_type(pbmc.X)
     pbmc.var_names_make_unique()
@@ -400,11 +444,10 @@ def test_compare_to_upstream(  # noqa: PLR0917
 
 
 @needs.skmisc
-def test_compare_to_seurat_v3():
+def test_compare_to_seurat_v3(pbmc):
     ### test without batch
     seurat_hvg_info = pd.read_csv(FILE_V3)
 
-    pbmc = pbmc3k()
     sc.pp.filter_cells(pbmc, min_genes=200)  # this doesnt do anything btw
     sc.pp.filter_genes(pbmc, min_cells=3)
 
@@ -469,8 +512,8 @@ def test_compare_to_seurat_v3():
 
 
 @needs.skmisc
-def test_seurat_v3_warning():
-    pbmc = pbmc3k()[:200].copy()
+def test_seurat_v3_warning(pbmc3k_sess):
+    pbmc = pbmc3k_sess[:200].copy()
     sc.pp.log1p(pbmc)
     with pytest.warns(
         UserWarning,
@@ -479,8 +522,8 @@ def test_seurat_v3_warning():
         sc.pp.highly_variable_genes(pbmc, flavor="seurat_v3")
 
 
-def test_batches():
-    adata = pbmc68k_reduced()
+def test_batches(pbmc68k):
+    adata = pbmc68k
     adata[:100, :100].X = np.zeros((100, 100))
 
     adata.obs["batch"] = ["0" if i < 100 else "1" for i in range(adata.n_obs)]
@@ -535,8 +578,7 @@ def test_batches():
 
 
 @needs.skmisc
-def test_seurat_v3_mean_var_output_with_batchkey():
-    pbmc = pbmc3k()
+def test_seurat_v3_mean_var_output_with_batchkey(pbmc):
     pbmc.var_names_make_unique()
     n_cells = pbmc.shape[0]
     batch = np.zeros((n_cells), dtype=int)
@@ -544,8 +586,9 @@ def test_seurat_v3_mean_var_output_with_batchkey():
     pbmc.obs["batch"] = batch
 
     # true_mean, true_var = _get_mean_var(pbmc.X)
-    true_mean = np.mean(pbmc.X.toarray(), axis=0)
-    true_var = np.var(pbmc.X.toarray(), axis=0, dtype=np.float64, ddof=1)
+    dense = pbmc.X.toarray()
+    true_mean = np.mean(dense, axis=0)
+    true_var = np.var(dense, axis=0, dtype=np.float64, ddof=1)
 
     result_df = sc.pp.highly_variable_genes(
         pbmc, batch_key="batch", flavor="seurat_v3", n_top_genes=4000, inplace=False
@@ -567,8 +610,8 @@ def test_cellranger_n_top_genes_warning():
         sc.pp.highly_variable_genes(adata, n_top_genes=1000, flavor="cell_ranger")
 
 
-def test_cutoff_info():
-    adata = pbmc3k()[:200].copy()
+def test_cutoff_info(pbmc3k_sess):
+    adata = pbmc3k_sess[:200].copy()
     sc.pp.normalize_total(adata)
     sc.pp.log1p(adata)
     with pytest.warns(UserWarning, match="pass `n_top_genes`, all cutoffs are ignored"):
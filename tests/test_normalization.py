@@ -18,7 +18,7 @@ from testing.scanpy._helpers import (
 )
 
 # TODO: Add support for sparse-in-dask
-from testing.scanpy._pytest.params import ARRAY_TYPES
+from testing.scanpy._pytest.params import ARRAY_TYPES, ARRAY_TYPES_DASK
 
 if TYPE_CHECKING:
     from collections.abc import Callable
@@ -140,6 +140,22 @@ def test_normalize_pearson_residuals_errors(pbmc3k_parametrized, params, match):
         sc.experimental.pp.normalize_pearson_residuals(adata, **params)
 
 
+def test_normalize_pearson_residuals_input_untouched(pbmc3k_parametrized_small):
+    adata = pbmc3k_parametrized_small()
+    X_before = adata.X
+    X_copy = X_before.copy()
+
+    sc.experimental.pp.normalize_pearson_residuals(adata, inplace=False)
+
+    # residual computation works on a freshly allocated output buffer,
+    # so the input matrix must be neither replaced nor mutated
+    assert adata.X is X_before
+    if issparse(X_before):
+        assert (X_before != X_copy).nnz == 0
+    else:
+        np.testing.assert_array_equal(X_before, X_copy)
+
+
 @pytest.mark.parametrize(
     "sparsity_func", [np.array, csr_matrix], ids=lambda x: x.__name__
 )
@@ -193,6 +209,60 @@ def test_normalize_pearson_residuals_values(sparsity_func, dtype, theta, clip):
         assert np.min(output_X) >= -clip
 
 
+@pytest.mark.parametrize(
+    "sparsity_func", [np.array, csr_matrix], ids=lambda x: x.__name__
+)
+def test_normalize_pearson_residuals_dtype(sparsity_func):
+    X = np.array([[3, 6], [2, 4], [1, 0]])
+    adata = AnnData(sparsity_func(X).astype("int64"))
+
+    res64 = sc.experimental.pp.normalize_pearson_residuals(adata, inplace=False)
+    res32 = sc.experimental.pp.normalize_pearson_residuals(
+        adata, dtype=np.float32, inplace=False
+    )
+
+    assert res64["X"].dtype == np.float64
+    assert res32["X"].dtype == np.float32
+    np.testing.assert_allclose(res32["X"], res64["X"], rtol=1e-6, atol=1e-6)
+
+
+@pytest.mark.parametrize(
+    "sparsity_func", [np.array, csr_matrix], ids=lambda x: x.__name__
+)
+def test_normalize_pearson_residuals_out(sparsity_func):
+    from scanpy.experimental.pp._normalization import _pearson_residuals
+
+    X = sparsity_func(np.array([[3, 6], [2, 4], [1, 0]]))
+    reference = _pearson_residuals(X, 100, None, True)
+
+    out = np.empty(X.shape, dtype=np.float64)
+    residuals = _pearson_residuals(X, 100, None, True, out=out)
+
+    # the residuals must be written into (and returned as) the supplied buffer
+    assert residuals is out
+    np.testing.assert_array_equal(out, reference)
+
+    with pytest.raises(ValueError, match="`out` must have the same shape as `X`"):
+        _pearson_residuals(X, 100, None, True, out=np.empty((2, 2)))
+
+
+@pytest.mark.parametrize("array_type", ARRAY_TYPES_DASK)
+@pytest.mark.parametrize("dtype", ["float32", "int64"])
+def test_normalize_pearson_residuals_dask(array_type, dtype):
+    from scanpy._compat import DaskArray
+
+    X = np.random.default_rng(0).poisson(2, size=(60, 20)).astype(dtype)
+    adata = AnnData(array_type(X))
+    adata_mem = AnnData(X.copy())
+
+    output = sc.experimental.pp.normalize_pearson_residuals(adata, inplace=False)
+    reference = sc.experimental.pp.normalize_pearson_residuals(adata_mem, inplace=False)
+
+    # the residuals stay lazy until computed
+    assert isinstance(output["X"], DaskArray)
+    np.testing.assert_allclose(output["X"].compute(), reference["X"])
+
+
 def _check_pearson_pca_fields(ad, n_cells, n_comps):
     assert {"pearson_residuals_normalization", "pca"} <= ad.uns.keys(), (
         "Missing `.uns` keys. Expected `['pearson_residuals_normalization', 'pca']`, "
@@ -323,3 +393,43 @@ def test_normalize_pearson_residuals_recipe(pbmc3k_parametrized_small, n_hvgs, n
     assert adata.varm["PCs"].shape == (n_genes, n_comps)
     # number of all-zero-colums should be number of non-hvgs
     assert sum(np.sum(np.abs(adata.varm["PCs"]), axis=1) == 0) == n_genes - n_hvgs
+
+
+@pytest.mark.parametrize(
+    ("func", "kwargs"),
+    [
+        pytest.param(
+            sc.experimental.pp.normalize_pearson_residuals_pca, dict(), id="pca"
+        ),
+        pytest.param(
+            sc.experimental.pp.recipe_pearson_residuals,
+            dict(n_top_genes=100),
+            id="recipe",
+        ),
+    ],
+)
+def test_normalize_pearson_residuals_pca_return_df(
+    pbmc3k_parametrized_small, func, kwargs
+):
+    import pandas as pd
+
+    adata = pbmc3k_parametrized_small()
+    adata_df = adata.copy()
+
+    func(adata, inplace=True, n_comps=30, **kwargs)
+    func(adata_df, inplace=True, n_comps=30, return_df=True, **kwargs)
+
+    # by default, the residuals are stored as a plain array
+    norm_dict = adata.uns["pearson_residuals_normalization"]
+    assert "pearson_residuals_df" not in norm_dict
+    residuals = norm_dict["pearson_residuals"]
+    assert isinstance(residuals, np.ndarray)
+
+    # with return_df=True, as a labeled DataFrame with the same values
+    norm_dict_df = adata_df.uns["pearson_residuals_normalization"]
+    assert "pearson_residuals" not in norm_dict_df
+    residuals_df = norm_dict_df["pearson_residuals_df"]
+    assert isinstance(residuals_df, pd.DataFrame)
+    assert residuals_df.index.equals(adata.obs_names)
+    assert residuals_df.columns.isin(adata.var_names).all()
+    np.testing.assert_array_equal(residuals, residuals_df.to_numpy())